@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class VulnerabilityDTO:
     """DTO for vulnerability output"""
     id: str
@@ -15,7 +15,7 @@ class VulnerabilityDTO:
     kev: bool
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResultDTO:
     """DTO for analysis result output"""
     sbom_id: str
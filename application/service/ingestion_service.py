@@ -1,6 +1,7 @@
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Tuple, List, Dict
-from core.entities import Component, Vulnerability
+from core.entities import Component, Vulnerability, to_score
 from core.interface import IVulnerabilityLookup
 from core.exceptions import InvalidSBOMException
 
@@ -17,9 +18,11 @@ class IngestionService:
         Automatically scans for vulnerabilities using OSV.dev PURL lookup
         """
         if not sbom_data.get('components'):
-            raise InvalidSBOMException("SBOM must contain components")
+            raise InvalidSBOMException(missing_field="components")
         
         components = []
+        # Indexed once by affected bom-ref instead of rescanning every entry for each component
+        sbom_vulns = self._index_sbom_vulnerabilities(sbom_data)
         
         # Step 1: Parse all components first (without vulnerabilities)
         for comp_data in sbom_data.get('components', []):
@@ -36,26 +39,51 @@ class IngestionService:
             )
             
             # Check if SBOM already has vulnerabilities (VEX data)
-            for vuln_data in sbom_data.get('vulnerabilities', []):
-                cve_id = vuln_data.get('id', 'UNKNOWN')
-                ratings = vuln_data.get('ratings', [])
-                cvss_score = ratings[0].get('score', 0) if ratings else 0
-                cvss_vector = ratings[0].get('vector', '') if ratings else ''
-                if {"ref":bom_ref} in vuln_data.get('affects', []) : 
-                    vulnerability = Vulnerability(
-                        id=cve_id,
-                        component_ref=bom_ref,
-                        component_name=component.name,
-                        cvss_score=cvss_score,
-                        cvss_vector=cvss_vector,
-                        description=vuln_data.get('description', 'No description'),
-                        severity=cvss_score / 10.0
-                    )
-                    
-                    component.vulnerabilities.append(vulnerability)
+            for vuln_data, cvss_score, cvss_vector in sbom_vulns.get(bom_ref, ()):
+                vulnerability = Vulnerability(
+                    id=vuln_data.get('id', 'UNKNOWN'),
+                    component_ref=bom_ref,
+                    component_name=component.name,
+                    cvss_score=cvss_score,
+                    cvss_vector=cvss_vector,
+                    description=vuln_data.get('description', 'No description'),
+                    severity=cvss_score / 10.0
+                )
+                
+                component.vulnerabilities.append(vulnerability)
                 
             components.append(component)
         
+        # Deps.dev only needs the parsed components, so its lookup runs while OSV.dev is queried
+        print("Checking maintenance status via Deps.dev...")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            metadata_future = executor.submit(self.metadata_provider.get_metadata, components)
+            self._scan_vulnerabilities(components)
+            metadata_map = metadata_future.result()
+        
+        dependencies = sbom_data.get('dependencies', [])
+        now_utc = datetime.now(timezone.utc)
+        
+        for comp in components:
+            if comp.bom_ref in metadata_map:
+                meta = metadata_map[comp.bom_ref]
+                comp.published_at = meta.get('published_at')
+                comp.is_deprecated = meta.get('is_deprecated', False)
+                
+                risk = 0.0
+                if comp.is_deprecated:
+                    risk += 0.7
+                
+                if comp.published_at:
+                    age_years = (now_utc - comp.published_at.astimezone(timezone.utc)).days / 365.0
+                    if age_years > 3: risk += 0.3
+                    elif age_years > 2: risk += 0.1
+                comp.maintenance_risk_score = min(risk, 1.0)
+                
+        return components, dependencies
+    
+    def _scan_vulnerabilities(self, components: List[Component]) -> None:
+        """Attach OSV.dev findings to the parsed components"""
         # Step 2: Batch scan ALL components for vulnerabilities using PURL
         print(f"🔍 Scanning {len(components)} components via OSV.dev PURL lookup...")
         
@@ -74,8 +102,12 @@ class IngestionService:
                         if osv_vuln.id not in existing_ids:
                             comp.vulnerabilities.append(osv_vuln)
             
-            total_vulns = sum(len(comp.vulnerabilities) for comp in components)
-            affected_comps = len([c for c in components if c.vulnerabilities])
+            total_vulns = 0
+            affected_comps = 0
+            for comp in components:
+                n_vulns = len(comp.vulnerabilities)
+                total_vulns += n_vulns
+                affected_comps += n_vulns > 0
             print(f"Found {total_vulns} vulnerabilities in {affected_comps}/{len(components)} components")
         else:
             # Fallback: Legacy CVE-based lookup (not recommended)
@@ -87,26 +119,20 @@ class IngestionService:
                         if osv_data:
                             vuln.cvss_score = osv_data.get('cvss_score', 0)
                             vuln.cvss_vector = osv_data.get('cvss_vector', '')
-        
-        dependencies = sbom_data.get('dependencies', [])
-        
-        print(f"Checking maintenance status via Deps.dev...")
-        metadata_map = self.metadata_provider.get_metadata(components)
-        
-        for comp in components:
-            if comp.bom_ref in metadata_map:
-                meta = metadata_map[comp.bom_ref]
-                comp.published_at = meta.get('published_at')
-                comp.is_deprecated = meta.get('is_deprecated', False)
-                
-                risk = 0.0
-                if comp.is_deprecated:
-                    risk += 0.7
-                
-                if comp.published_at:
-                    age_years = (datetime.now(comp.published_at.tzinfo) - comp.published_at).days / 365.0
-                    if age_years > 3: risk += 0.3
-                    elif age_years > 2: risk += 0.1
-                comp.maintenance_risk_score = min(risk, 1.0)
-                
-        return components, dependencies
\ No newline at end of file
+    
+    def _index_sbom_vulnerabilities(self, sbom_data: Dict) -> Dict[str, List[Tuple[Dict, float, str]]]:
+        """Group the SBOM's own vulnerability entries by the bom-ref they affect, ratings parsed once"""
+        by_ref: Dict[str, List[Tuple[Dict, float, str]]] = {}
+        for vuln_data in sbom_data.get('vulnerabilities', []):
+            ratings = vuln_data.get('ratings', [])
+            # Coerced once at the boundary; SBOM ratings may carry scores as strings ("7.5", "INFO")
+            cvss_score = to_score(ratings[0].get('score', 0)) if ratings else 0.0
+            cvss_vector = ratings[0].get('vector', '') if ratings else ''
+            # Entries without a string ref (malformed SBOMs) affect no component
+            refs = dict.fromkeys(
+                affect['ref'] for affect in vuln_data.get('affects', [])
+                if isinstance(affect, dict) and 'ref' in affect and isinstance(affect['ref'], str)
+            )
+            for ref in refs:
+                by_ref.setdefault(ref, []).append((vuln_data, cvss_score, cvss_vector))
+        return by_ref
@@ -11,7 +11,7 @@ class Priority(Enum):
     LOW = "LOW"
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     bom_ref: str
     name: str
@@ -26,7 +26,24 @@ class Component:
         return hash(self.bom_ref)
 
 
-@dataclass
+def to_score(value) -> float:
+    """Coerce a score that may arrive as a string ("7.5", "INFO") to float; unparseable values are 0.0"""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return 0.0
+    return float(value or 0.0)
+
+
+def to_flag(value) -> bool:
+    """Coerce a flag that may arrive as a string ("true", "1") to bool"""
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 't', 'yes')
+    return bool(value)
+
+
+@dataclass(slots=True)
 class Vulnerability:
     id: str
     component_ref: str
@@ -49,25 +66,8 @@ class Vulnerability:
     def __hash__(self):
         return hash(self.id)
 
-    def __post_init__(self):
-        float_fields = [
-            'cvss_score', 'severity', 'tcs', 'vei', 
-            'epss', 'exploitability', 'hdfm_score'
-        ]
-        
-        for field_name in float_fields:
-            value = getattr(self, field_name)
-            if isinstance(value, str):
-                try:
-                    # Convert to float
-                    setattr(self, field_name, float(value))
-                except ValueError:
-                    setattr(self, field_name, 0.0)
-
-        if isinstance(self.kev, str):
-            self.kev = self.kev.lower() in ('true', '1', 't', 'yes')
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     sbom_id: str
     timestamp: datetime
@@ -1,26 +1,31 @@
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 import numpy as np
-import pandas as pd
 
 from core.entities import Priority, Vulnerability
 
 
+ENTROPY_COLUMNS = ('severity', 'tcs', 'vei', 'exploitability')
+
+# CVSS Attack Vector (AV) metric -> Vector Exposure Index
+ATTACK_VECTOR_WEIGHTS = {
+    'N': 0.85,
+    'A': 0.6,
+    'L': 0.3,
+    'P': 0.1,
+}
+
+
 class HDFMModel:
     @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_vei(cvss_vector: str) -> float:
         if not cvss_vector:
             return 0.5
         
-        vector_map = {
-        'AV:N': 0.85,
-        'AV:A': 0.6, 
-        'AV:L': 0.3,
-        'AV:P': 0.1,
-        }
-        
-        for key, value in vector_map.items():
-            if key in cvss_vector:
-                return value
+        for token in cvss_vector.split('/'):
+            if token.startswith('AV:'):
+                return ATTACK_VECTOR_WEIGHTS.get(token[3:], 0.5)
         
         return 0.5
     
@@ -31,41 +36,43 @@ class HDFMModel:
         return 1 - (1 - epss) * (1 - p_kev)
     
     @staticmethod
-    def calculate_entropy_weights(metrics_df: pd.DataFrame) -> Dict[str, float]:
-        """Shannon Entropy"""
-        m = len(metrics_df)
+    def calculate_entropy_weights(metrics: np.ndarray, col_names: Tuple[str, ...] = ENTROPY_COLUMNS) -> Dict[str, float]:
+        """Shannon Entropy over an (m, n) matrix whose columns are named by col_names"""
+        metrics = np.asarray(metrics, dtype=np.float64)
+        m = metrics.shape[0]
         
         if m <= 1:
             return {'severity': 0.3, 'tcs': 0.3, 'vei': 0.1, 'exploitability': 0.3}
         
         k = 1.0 / np.log(m)
-        weights = {}
+        col_sums = metrics.sum(axis=0)
+        active = col_sums != 0
         
-        for col in ['severity', 'tcs', 'vei', 'exploitability']:
-            col_sum = metrics_df[col].sum()
-            
-            if col_sum == 0:
-                weights[col] = 0
-                continue
-            
-            p_ij = metrics_df[col] / col_sum
-            p_ij_clean = p_ij[p_ij > 0]
-            entropy = -k * np.sum(p_ij_clean * np.log(p_ij_clean))
-            weights[col] = 1 - entropy
+        # Columns summing to zero carry no information and keep a weight of 0
+        p_ij = np.divide(metrics, col_sums, out=np.zeros_like(metrics), where=active)
+        log_p = np.log(p_ij, out=np.zeros_like(p_ij), where=p_ij > 0)
+        entropy = -k * (p_ij * log_p).sum(axis=0)
         
-        total = sum(weights.values())
+        weights = np.where(active, 1 - entropy, 0.0)
+        total = weights.sum()
         
         if total == 0:
             return {'severity': 0.3, 'tcs': 0.3, 'vei': 0.1, 'exploitability': 0.3}
         
-        return {k: v / total for k, v in weights.items()}
+        return dict(zip(col_names, (weights / total).tolist()))
     
     @staticmethod
     def calculate_epss_median(vulnerabilities: List[Vulnerability]) -> float:
-        epss_scores = [v.epss for v in vulnerabilities]
-        if not epss_scores:
+        n = len(vulnerabilities)
+        if not n:
             return 0.0
-        return float(np.median(epss_scores))
+        epss_scores = np.fromiter((v.epss for v in vulnerabilities), dtype=np.float64, count=n)
+        # O(n) selection of the middle element(s) instead of a full sort
+        mid = n // 2
+        if n % 2:
+            return float(np.partition(epss_scores, mid)[mid])
+        lower, upper = np.partition(epss_scores, (mid - 1, mid))[mid - 1:mid + 1]
+        return float((lower + upper) / 2)
 
     @staticmethod
     def calculate_hdfm_score(vuln: Vulnerability, weights: Dict[str, float], eta: float) -> float:
@@ -90,6 +97,35 @@ class HDFMModel:
             final_score = base_score * 0.5
         return final_score
 
+    @staticmethod
+    def calculate_hdfm_scores(
+        severity: np.ndarray,
+        tcs: np.ndarray,
+        vei: np.ndarray,
+        exploitability: np.ndarray,
+        cvss_score: np.ndarray,
+        weights: Dict[str, float],
+        eta: float
+    ) -> np.ndarray:
+        """Vectorized calculate_hdfm_score over column arrays, clipped to 1.0"""
+        # Weight lookups happen once per analysis, not once per vulnerability
+        w_e = weights.get('exploitability', 0.3)
+        w_s = weights.get('severity', 0.3)
+        w_v = weights.get('vei', 0.1)
+        w_t = weights.get('tcs', 0.3)
+
+        base_score = exploitability * w_e + severity * w_s + vei * w_v + tcs * w_t
+
+        # Same mutually exclusive branches as calculate_hdfm_score, first match wins
+        conditions = [
+            (cvss_score >= 9.8) & (tcs >= 0.7) & (exploitability >= 0.5),
+            (cvss_score >= 9.0) & (vei >= 0.85) & (tcs >= 0.5),
+            (vei >= 0.8) & (tcs >= 0.4),
+        ]
+        # Select a scalar multiplier per row instead of materialising four scaled copies
+        base_score *= np.select(conditions, [1.5, 1.2, 1.0], default=0.5)
+        return np.minimum(base_score, 1.0, out=base_score)
+
     @staticmethod
     def assign_priority(hdfm_score: float) -> Priority:
         if hdfm_score > 0.8:
@@ -28,6 +28,15 @@ class IThreatIntelligence(ABC):
     def is_kev(self, cve_id: str) -> bool:
         pass
     
+    @abstractmethod
+    def batch_lookup(self, cve_ids: List[str]) -> Dict[str, Tuple[float, bool]]:
+        """
+        Returns threat intel for many CVEs in one call.
+        Key: cve_id
+        Value: (epss_score, is_kev)
+        """
+        pass
+    
     @abstractmethod
     def sync_data(self) -> None:
         pass
@@ -60,7 +69,11 @@ class IRepository(ABC):
     """Port: Data persistence"""
     
     @abstractmethod
-    def save_sbom(self, sbom_data: Dict, source: str) -> str:
+    def save_sbom(self, sbom_data: Dict, source: str, raw_bytes: Optional[bytes] = None) -> str:
+        pass
+    
+    @abstractmethod
+    def save_sbom_stream(self, raw_bytes: bytes, source: str) -> str:
         pass
     
     @abstractmethod
@@ -80,5 +93,5 @@ class IRepository(ABC):
         pass
     
     @abstractmethod
-    def get_all_analyses(self, sbom_id: str) -> List[AnalysisResult]:
+    def get_all_analyses(self, sbom_id: str, limit: Optional[int] = None, offset: int = 0) -> List[AnalysisResult]:
         pass
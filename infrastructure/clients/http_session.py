@@ -0,0 +1,22 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transient upstream statuses worth retrying (rate limiting, gateway hiccups)
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def create_http_session(pool_size: int = 64, retries: int = 3) -> requests.Session:
+    """
+    Shared HTTP session with keep-alive connection pooling.
+    Reusing one session across adapters avoids a TCP + TLS handshake per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=retries, backoff_factor=0.3, status_forcelist=RETRY_STATUSES, raise_on_status=False)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,14 +1,43 @@
+import json
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Optional, Dict, List, Set
 from core.entities import Component, Vulnerability
 from core.interface import IVulnerabilityLookup
+from infrastructure.clients.http_session import create_http_session
+from infrastructure.persistence.response_cache import ResponseCache
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser accepts bytes as well
+    json_loads = json.loads
+
+# Heuristic risk contribution per CVSS v3 metric token
+CVSS_METRIC_WEIGHTS = {
+    'AV:N': 3.0, 'AV:A': 2.0, 'AV:L': 1.0,
+    'AC:L': 2.0,
+    'PR:N': 2.0,
+    'C:H': 1.0, 'I:H': 1.0, 'A:H': 1.0,
+}
+
+# Fallback CVSS score for the qualitative database_specific severity
+SEVERITY_SCORES = {'CRITICAL': 9.5, 'HIGH': 7.5, 'MODERATE': 5.0, 'MEDIUM': 5.0, 'LOW': 2.5}
+
 
 class OSVVulnerabilityLookup(IVulnerabilityLookup):
     
-    def __init__(self, base_url: str = "https://api.osv.dev/v1"):
+    # Advisories get attached to package versions over time, so querybatch answers expire sooner than vuln records
+    QUERY_CACHE_TTL = timedelta(hours=6)
+    
+    def __init__(self, base_url: str = "https://api.osv.dev/v1", max_workers: int = 32,
+                 session: Optional[requests.Session] = None, response_cache: Optional[ResponseCache] = None):
         self.base_url = base_url
+        self.max_workers = max_workers
+        self.session = session or create_http_session(pool_size=max_workers)
         self.cache = {}
+        self.response_cache = response_cache
         self.logger = logging.getLogger(__name__)
     
     def lookup_vulnerability(self, vuln_id: str) -> Optional[Dict]:
@@ -17,14 +46,14 @@ class OSVVulnerabilityLookup(IVulnerabilityLookup):
             return self.cache[vuln_id]
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/vulns/{vuln_id}",
                 timeout=10
             )
             
             if response.status_code != 200:
                 return None
-            vuln = response.json()
+            vuln = json_loads(response.content)
             self.cache[vuln_id] = vuln
             return vuln
             
@@ -45,115 +74,146 @@ class OSVVulnerabilityLookup(IVulnerabilityLookup):
         """
         Batch lookup vulnerabilities by PURL
         Step 1: Query Batch API to get list of IDs
-        Step 2: If details (aliases) are missing, fetch full record individually
+        Step 2: If details (aliases) are missing, fetch full records in parallel
         Step 3: Deduplicate and prioritize CVEs
         """
         # Build Query ---
-        queries = []
-        component_map = {}
-        
+        # Components sharing a purl (diamond dependencies) are queried once
+        purl_components: Dict[str, List[Component]] = {}
         for comp in components:
             purl = comp.purl or self._construct_purl_from_component(comp)
             if purl:
-                query = {"package": {"purl": purl}}
-                queries.append(query)
-                component_map[len(queries) - 1] = comp
-            print(purl)
-        if not queries:
+                purl_components.setdefault(purl, []).append(comp)
+        if not purl_components:
             return {}
         
+        # Purls answered recently (e.g. on reanalyze) are served from the persistent cache
+        purl_vulns = self._cached_query_results(purl_components)
+        pending = [purl for purl in purl_components if purl not in purl_vulns]
+        
         # Process in Chunks ---
+        # Chunks are independent, so they are posted concurrently rather than one after another
         chunk_size = 1000
-        all_results = {}
-        
-        for i in range(0, len(queries), chunk_size):
-            chunk = queries[i:i + chunk_size]
-            
-            try:
-                response = requests.post(
-                    f"{self.base_url}/querybatch",
-                    json={"queries": chunk},
-                    timeout=30
+        offsets = range(0, len(pending), chunk_size)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(offsets))) as executor:
+                chunk_results = executor.map(
+                    self._query_batch,
+                    ([{"package": {"purl": purl}} for purl in pending[i:i + chunk_size]] for i in offsets)
                 )
-                
-                if response.status_code != 200:
-                    self.logger.error(f"OSV batch query failed: {response.status_code}")
-                    continue
-                
-                batch_results = response.json()
-                
-                for idx, result in enumerate(batch_results.get('results', [])):
-                    global_idx = i + idx
-                    comp = component_map.get(global_idx)
-                    if not comp: continue
-                    
-                    raw_vulns = result.get('vulns', [])
-                    hydrated_vulns = []
-                    
-                    # Hydrate Data (The Fix) ---
-                    for v in raw_vulns:
-                        v_id = v.get('id', '')
-                        
-                        if not v.get('aliases'):
-                            full_record = self.lookup_vulnerability(v_id)
-                            if full_record:
-                                hydrated_vulns.append(full_record)
-                            else:
-                                hydrated_vulns.append(v) # Fallback to slim
-                        else:
-                            hydrated_vulns.append(v)
-                    
-                    if hydrated_vulns:
-                        # Deduplicate & Convert ---
-                        comp_vulns = self._deduplicate_vulnerabilities(hydrated_vulns, comp)
-                        if comp_vulns:
-                            all_results[comp.bom_ref] = comp_vulns
-                            
-            except Exception as e:
-                self.logger.error(f"Error in batch lookup: {e}")
-                continue
+                fetched = {}
+                for i, results in zip(offsets, chunk_results):
+                    if results is not None:
+                        fetched.update(zip(pending[i:i + chunk_size], results))
+            purl_vulns.update(fetched)
+            self._store_in_cache({f"osv:query/{purl}": vulns for purl, vulns in fetched.items()})
+        
+        batch_hits = [
+            (comp, raw_vulns)
+            for purl, comps in purl_components.items()
+            if (raw_vulns := purl_vulns.get(purl))
+            for comp in comps
+        ]
+        
+        # Hydrate Data (The Fix) ---
+        # Slim records without aliases are fetched by ID concurrently instead of one by one
+        missing_ids = dict.fromkeys(
+            v.get('id') for _, raw_vulns in batch_hits for v in raw_vulns
+            if not v.get('aliases') and v.get('id')
+        )
+        # Records already cached are served directly; only the rest go to the pool
+        hydrated = {v_id: self.cache[v_id] for v_id in missing_ids if v_id in self.cache}
+        missing_ids = [v_id for v_id in missing_ids if v_id not in hydrated]
+        if missing_ids and self.response_cache:
+            persisted = self.response_cache.get_many(f"osv:vulns/{v_id}" for v_id in missing_ids)
+            for v_id in missing_ids:
+                vuln = persisted.get(f"osv:vulns/{v_id}")
+                if vuln is not None:
+                    hydrated[v_id] = self.cache[v_id] = vuln
+            missing_ids = [v_id for v_id in missing_ids if v_id not in hydrated]
+        if missing_ids:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing_ids))) as executor:
+                fetched = {
+                    v_id: vuln
+                    for v_id, vuln in zip(missing_ids, executor.map(self.lookup_vulnerability, missing_ids))
+                    if vuln is not None
+                }
+            hydrated.update(fetched)
+            self._store_in_cache({f"osv:vulns/{v_id}": vuln for v_id, vuln in fetched.items()})
+        
+        # Deduplicate & Convert ---
+        all_results = {}
+        for comp, raw_vulns in batch_hits:
+            hydrated_vulns = [
+                v if v.get('aliases') else (hydrated.get(v.get('id', '')) or v)  # Fallback to slim
+                for v in raw_vulns
+            ]
+            comp_vulns = self._deduplicate_vulnerabilities(hydrated_vulns, comp)
+            if comp_vulns:
+                all_results[comp.bom_ref] = comp_vulns
     
         return all_results
 
+    def _cached_query_results(self, purls) -> Dict[str, List[Dict]]:
+        """Raw vulns per purl from querybatch answers cached within QUERY_CACHE_TTL"""
+        if not self.response_cache:
+            return {}
+        cached = self.response_cache.get_many((f"osv:query/{purl}" for purl in purls), max_age=self.QUERY_CACHE_TTL)
+        return {key[len("osv:query/"):]: vulns for key, vulns in cached.items()}
+
+    def _store_in_cache(self, values: Dict[str, object]) -> None:
+        """Persist fetched answers; a failed cache write is logged and never costs the data already in hand"""
+        if not self.response_cache or not values:
+            return
+        try:
+            self.response_cache.set_many(values)
+        except Exception as e:
+            self.logger.warning(f"Could not write {len(values)} OSV responses to the cache: {e}")
+
+    def _query_batch(self, chunk: List[Dict]) -> Optional[List[List[Dict]]]:
+        """POST one /querybatch chunk; returns the raw vulns of every query in order, or None when it failed"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/querybatch",
+                json={"queries": chunk},
+                timeout=30
+            )
+            
+            if response.status_code != 200:
+                self.logger.error(f"OSV batch query failed: {response.status_code}")
+                return None
+            
+            # Every answer is kept for the query cache and hydration, so the body is parsed in one go
+            results = json_loads(response.content).get('results', [])
+            return [result.get('vulns', []) for result in results]
+                        
+        except Exception as e:
+            self.logger.error(f"Error in batch lookup: {e}")
+            return None
+
     def _deduplicate_vulnerabilities(self, osv_vulns: List[Dict], comp: Component) -> List[Vulnerability]:
         """Deduplicate and prioritize CVE over GHSA"""
-        vuln_groups = {} 
-        seen_ids = set()
+        # Union-Find over id + aliases: records sharing any identifier end up in one cluster
+        parent: Dict[str, str] = {}
+
+        def find(x: str) -> str:
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # Path halving
+                x = parent[x]
+            return x
 
         for osv_data in osv_vulns:
-            vuln_id = osv_data.get('id', 'UNKNOWN')
-            aliases = set(osv_data.get('aliases', []))
-            
-            found_group = None
-            
-            # Check overlap via ID
-            if vuln_id in seen_ids:
-                for gid, g_vulns in vuln_groups.items():
-                    for v in g_vulns:
-                        if v['id'] == vuln_id or vuln_id in v.get('aliases', []):
-                            found_group = gid
-                            break
-                    if found_group: break
-            
-            # Check overlap via Aliases
-            if not found_group:
-                for gid, g_vulns in vuln_groups.items():
-                    group_ids = set()
-                    for v in g_vulns:
-                        group_ids.add(v['id'])
-                        group_ids.update(v.get('aliases', []))
-                    
-                    if vuln_id in group_ids or not aliases.isdisjoint(group_ids):
-                        found_group = gid
-                        break
-            
-            if found_group:
-                vuln_groups[found_group].append(osv_data)
-            else:
-                vuln_groups[vuln_id] = [osv_data]
-            
-            seen_ids.add(vuln_id)
-            seen_ids.update(aliases)
+            root = find(osv_data.get('id', 'UNKNOWN'))
+            for alias in osv_data.get('aliases', []):
+                alias_root = find(alias)
+                if alias_root != root:
+                    parent[alias_root] = root
+
+        # Clusters keep first-seen order, members keep input order
+        vuln_groups = {}
+        for osv_data in osv_vulns:
+            vuln_groups.setdefault(find(osv_data.get('id', 'UNKNOWN')), []).append(osv_data)
         
         # Pick winners
         deduplicated = []
@@ -167,18 +227,17 @@ class OSVVulnerabilityLookup(IVulnerabilityLookup):
 
     def _pick_best_vulnerability(self, osv_group: List[Dict]) -> Dict:
         """Pick the best representative: CVE > GHSA > others"""
-        cve_vulns = []
-        ghsa_vulns = []
+        first_ghsa = None
         
+        # The first CVE wins outright, so the common single-CVE group needs no second pass
         for osv_data in osv_group:
             vuln_id = osv_data.get('id', '')
-            if vuln_id.startswith('CVE-'):
-                cve_vulns.append(osv_data)
-            elif vuln_id.startswith('GHSA-'):
-                ghsa_vulns.append(osv_data)
+            if vuln_id[:4] == 'CVE-':
+                return osv_data
+            if first_ghsa is None and vuln_id[:5] == 'GHSA-':
+                first_ghsa = osv_data
         
-        if cve_vulns: return cve_vulns[0]
-        if ghsa_vulns: return ghsa_vulns[0]
+        if first_ghsa: return first_ghsa
         return osv_group[0] if osv_group else None
     
     def _construct_purl_from_component(self, comp: Component) -> Optional[str]:
@@ -196,7 +255,7 @@ class OSVVulnerabilityLookup(IVulnerabilityLookup):
         vuln_id = osv_data.get('id', 'UNKNOWN')
         aliases = osv_data.get('aliases', [])
         
-        cve_id = next((a for a in aliases if a.startswith('CVE-')), None)
+        cve_id = next((a for a in aliases if a[:4] == 'CVE-'), None)
         if cve_id:
             vuln_id = cve_id
         
@@ -217,13 +276,12 @@ class OSVVulnerabilityLookup(IVulnerabilityLookup):
         if cvss_score == 0.0:
             db_specific = osv_data.get('database_specific', {})
             severity_str = db_specific.get('severity', '').upper()
-            severity_map = {'CRITICAL': 9.5, 'HIGH': 7.5, 'MODERATE': 5.0, 'MEDIUM': 5.0, 'LOW': 2.5}
-            if severity_str in severity_map:
-                cvss_score = severity_map[severity_str]
+            if severity_str in SEVERITY_SCORES:
+                cvss_score = SEVERITY_SCORES[severity_str]
         
-        summary = osv_data.get('summary', '')
-        details = osv_data.get('details', '')
-        description = summary or details or 'No description available'
+        # Unscored records without text are still findings; only the description slicing is skipped
+        text = osv_data.get('summary', '') or osv_data.get('details', '')
+        description = text[:500] if text else 'No description available'
         
         return Vulnerability(
             id=vuln_id,
@@ -231,21 +289,14 @@ class OSVVulnerabilityLookup(IVulnerabilityLookup):
             component_name=comp.name,
             cvss_score=cvss_score,
             cvss_vector=cvss_vector,
-            description=description[:500],
+            description=description,
             severity=cvss_score / 10.0
         )
 
     def _parse_cvss_score(self, cvss_vector: str) -> float:
         if not cvss_vector: return 0.0
-        risk_score = 0.0
-        if 'AV:N' in cvss_vector: risk_score += 3.0
-        elif 'AV:A' in cvss_vector: risk_score += 2.0
-        elif 'AV:L' in cvss_vector: risk_score += 1.0
-        if 'AC:L' in cvss_vector: risk_score += 2.0
-        if 'PR:N' in cvss_vector: risk_score += 2.0
-        if 'C:H' in cvss_vector: risk_score += 1.0
-        if 'I:H' in cvss_vector: risk_score += 1.0
-        if 'A:H' in cvss_vector: risk_score += 1.0
+        tokens = set(cvss_vector.split('/'))
+        risk_score = sum(weight for metric, weight in CVSS_METRIC_WEIGHTS.items() if metric in tokens)
         return min(risk_score, 10.0)
 
     def _extract_vulnerability_data(self, vuln: Dict) -> Dict:
@@ -1,91 +1,164 @@
+import json
+import re
 import requests
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import quote_plus
 
 from core.entities import Component
 from core.interface import IMetadataProvider
+from infrastructure.clients.http_session import create_http_session
+from infrastructure.persistence.response_cache import ResponseCache
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser accepts bytes as well
+    json_loads = json.loads
+
+# pkg:<type>/<namespace/name>@<version>; the version is everything after the last '@'
+_PURL_RE = re.compile(r'^pkg:([^/]+)/(.+)@([^@]+)$')
+
+# PURL type -> Deps.dev system
+PURL_SYSTEMS = {
+    'npm': 'npm',
+    'pypi': 'pypi',
+    'maven': 'maven',
+    'go': 'go',
+    'cargo': 'cargo',
+    'nuget': 'nuget'
+}
 
 class DepsDevClient(IMetadataProvider):
     BASE_URL = "https://api.deps.dev/v3alpha"
+    BATCH_SIZE = 5000  # GetVersionBatch request limit
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, max_workers: int = 32,
+                 response_cache: Optional[ResponseCache] = None):
         self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.session = session or create_http_session(pool_size=max_workers)
+        self.response_cache = response_cache
+        self._url_tmpl = self.BASE_URL + '/systems/%s/packages/%s/versions/%s'
 
     def get_metadata(self, components: List[Component]) -> Dict[str, Dict]:
         """Fetch deprecation and timestamp data"""
-        results = {}
-        
-        # Deps.dev doesn't support batching well, so we do individual lookups.
+        keyed = []
         for comp in components:
             if not comp.purl:
                 continue
-                
             system, name, version = self._parse_purl(comp.purl)
-            if not system or not name or not version:
-                continue
+            if system and name and version:
+                keyed.append((comp, (system, name, version)))
+        if not keyed:
+            return {}
 
-            try:
-                safe_name = quote_plus(name)
-                url = f"{self.BASE_URL}/systems/{system}/packages/{safe_name}/versions/{version}"
-                
-                response = requests.get(url, timeout=2)
+        # Serve cached versions first, then fetch the rest in as few requests as possible
+        keys = list(dict.fromkeys(key for _, key in keyed))
+        urls = {key: self._version_url(key) for key in keys}
+        cached = self.response_cache.get_many(urls.values()) if self.response_cache else {}
+        versions = {key: cached[urls[key]] for key in keys if urls[key] in cached}
+        pending = [key for key in keys if key not in versions]
+
+        if pending:
+            fetched = self._fetch_version_batch(pending)
+            if fetched is None:
+                # Batch endpoint unavailable: fall back to concurrent per-version lookups
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                    fetched = {
+                        key: data for key, data in zip(pending, executor.map(self._fetch_version, pending))
+                        if data is not None
+                    }
+            versions.update(fetched)
+            if self.response_cache:
+                self.response_cache.set_many({self._version_url(key): data for key, data in fetched.items()})
+
+        return {
+            comp.bom_ref: self._to_metadata(versions[key])
+            for comp, key in keyed if key in versions
+        }
+
+    def _fetch_version_batch(self, keys: List[Tuple[str, str, str]]) -> Optional[Dict[Tuple[str, str, str], Dict]]:
+        """
+        Resolve many versions through GetVersionBatch (POST /versionbatch).
+        Returns None if the batch endpoint fails so the caller can fall back.
+        """
+        versions = {}
+        try:
+            for i in range(0, len(keys), self.BATCH_SIZE):
+                body = {"requests": [
+                    {"versionKey": {"system": system.upper(), "name": name, "version": version}}
+                    for system, name, version in keys[i:i + self.BATCH_SIZE]
+                ]}
                 
-                if response.status_code == 200:
-                    data = response.json()
+                while True:
+                    response = self.session.post(f"{self.BASE_URL}/versionbatch", json=body, timeout=30)
+                    if response.status_code != 200:
+                        self.logger.error(f"Deps.dev batch query failed: {response.status_code}")
+                        return None
                     
-                    # 1. Published Date
-                    published_str = data.get('publishedAt')
-                    published_at = None
-                    if published_str:
-                        try:
-                            published_at = datetime.fromisoformat(published_str.replace('Z', '+00:00'))
-                        except ValueError:
-                            pass
-
-                    # 2. Deprecated Status
-                    is_deprecated = data.get('isDeprecated', False)
+                    data = json_loads(response.content)
+                    for entry in data.get('responses', []):
+                        version = entry.get('version')
+                        requested = entry.get('request', {}).get('versionKey', {})
+                        if version:
+                            key = (requested.get('system', '').lower(), requested.get('name'), requested.get('version'))
+                            versions[key] = version
                     
-                    results[comp.bom_ref] = {
-                        'published_at': published_at,
-                        'is_deprecated': is_deprecated
-                    }
+                    # Large batches are paginated; repeat the request with the page token
+                    page_token = data.get('nextPageToken')
+                    if not page_token:
+                        break
+                    body['pageToken'] = page_token
                     
-            except Exception as e:
-                self.logger.error(f"Error fetching metadata for {comp.name}: {e}")
-                
-        return results
+        except Exception as e:
+            self.logger.error(f"Error in Deps.dev batch lookup: {e}")
+            return None
+        
+        return versions
+
+    def _fetch_version(self, key: Tuple[str, str, str]) -> Optional[Dict]:
+        try:
+            response = self.session.get(self._version_url(key), timeout=2)
+            if response.status_code != 200:
+                return None
+            return json_loads(response.content)
+        except Exception as e:
+            self.logger.error(f"Error fetching metadata for {key[1]}: {e}")
+            return None
+
+    def _version_url(self, key: Tuple[str, str, str]) -> str:
+        system, name, version = key
+        return self._url_tmpl % (system, quote_plus(name), version)
+
+    def _to_metadata(self, data: Dict) -> Dict:
+        # 1. Published Date
+        published_str = data.get('publishedAt')
+        published_at = None
+        if published_str:
+            try:
+                published_at = datetime.fromisoformat(published_str.replace('Z', '+00:00'))
+            except ValueError:
+                pass
+
+        # 2. Deprecated Status
+        is_deprecated = data.get('isDeprecated', False)
+        
+        return {
+            'published_at': published_at,
+            'is_deprecated': is_deprecated
+        }
 
     def _parse_purl(self, purl: str) :
         """
         pkg:npm/axios@0.21.1 -> ('npm', 'axios', '0.21.1')
         """
-        try:
-            # Simple heuristic parser
-            if not purl.startswith('pkg:'): return None, None, None
-            
-            parts = purl[4:].split('/', 1)
-            type_part = parts[0] 
-            rest = parts[1]       
-            
-            system_map = {
-                'npm': 'npm',
-                'pypi': 'pypi',
-                'maven': 'maven',
-                'go': 'go',
-                'cargo': 'cargo',
-                'nuget': 'nuget'
-            }
-            system = system_map.get(type_part)
-            if not system: return None, None, None
-
-            if '@' in rest:
-                name_part, version_part = rest.rsplit('@', 1)
-            else:
-                return None, None, None
-                
-            return system, name_part, version_part
+        match = _PURL_RE.match(purl)
+        if not match: return None, None, None
+        type_part, name_part, version_part = match.groups()
+        
+        system = PURL_SYSTEMS.get(type_part)
+        if not system: return None, None, None
             
-        except Exception:
-            return None, None, None
\ No newline at end of file
+        return system, name_part, version_part
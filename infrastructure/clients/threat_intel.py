@@ -1,11 +1,24 @@
 # ============================================================================
 # infrastructure/clients/threat_intel_client.py - ADAPTER
 # ============================================================================
+import json
+import os
 import requests
 import logging
-from typing import Set, Dict, Optional
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set, Dict, List, Optional, Tuple
 
 from core.interface import IThreatIntelligence
+from infrastructure.clients.http_session import create_http_session
+from infrastructure.persistence.response_cache import ResponseCache
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it the KEV feed is parsed in one go
+    ijson = None
 
 
 class ThreatIntelClient(IThreatIntelligence):
@@ -13,14 +26,28 @@ class ThreatIntelClient(IThreatIntelligence):
     # API Endpoints
     EPSS_API_URL = "https://api.first.org/data/v1/epss"
     CISA_KEV_URL = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
+    EPSS_BATCH_SIZE = 100  # CVEs per request; matches the API's default page size
+    EPSS_TTL_SECONDS = 86_400  # EPSS is republished once a day
+    EPSS_CACHE_SIZE = 50_000
+    KEV_SYNC_WAIT_SECONDS = 10  # Longest one is_kev call or one whole batch_lookup waits for the initial sync
+    KEV_REFRESH_SECONDS = 3_600
+    KEV_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "hdfm", "kev.json")
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, max_workers: int = 8,
+                 response_cache: Optional[ResponseCache] = None,
+                 kev_snapshot_path: Optional[str] = KEV_SNAPSHOT_PATH):
         """
         Args:
             sbom_vulnerabilities: Optional dictionary of mock vulnerabilities from the SBOM.
                                   Used for evaluation test cases to override real API data.
         """
         self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.session = session or create_http_session(pool_size=max_workers)
+        self.response_cache = response_cache
+        self.kev_snapshot_path = kev_snapshot_path
+        # cve_id -> (score, monotonic fetch time)
+        self.epss_cache: Dict[str, Tuple[float, float]] = {}
         # O(1)
         self.kev_cache: Set[str] = set()
             
@@ -117,45 +144,189 @@ class ThreatIntelClient(IThreatIntelligence):
                 "cvss_vector": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
             }
         
-        self.sync_data()
+        # The KEV download runs in the background so construction never blocks on the network.
+        # Mock entries are usable straight away; lookups wait for the feed on first use.
+        self.kev_cache = {cve_id for cve_id, meta in self.mock_data.items() if meta.get('kev') is True}
+        self.kev_ready = threading.Event()
+        self._stop = threading.Event()
+        threading.Thread(target=self._sync_loop, name="kev-sync", daemon=True).start()
+
+    def _sync_loop(self) -> None:
+        try:
+            self.sync_data()
+        except Exception:
+            self.logger.exception("Initial KEV sync failed")
+        finally:
+            self.kev_ready.set()
+        # Long-running servers pick up catalog updates here; an unchanged feed only costs a 304
+        while not self._stop.wait(self.KEV_REFRESH_SECONDS):
+            try:
+                self.sync_data()
+            except Exception:
+                self.logger.exception("KEV refresh failed; retrying on the next cycle")
+
+    def close(self) -> None:
+        """Stops the background KEV refresh"""
+        self._stop.set()
 
     def get_epss_score(self, cve_id: str) -> float:
         """
         Fetches the EPSS probability score.
         Priority: 1. Mock Data (SBOM), 2. FIRST.org API
         """
-        # 1. Manual Lookup (Mock Data)
-        if cve_id in self.mock_data:
-            mock_epss = self.mock_data[cve_id].get("epss")
+        return self.get_epss_scores([cve_id])[cve_id]
+
+    def get_epss_scores(self, cve_ids: List[str]) -> Dict[str, float]:
+        """
+        Fetches EPSS probability scores for many CVEs.
+        Mock data wins, then scores fetched within EPSS_TTL_SECONDS; the rest are
+        queried in comma-separated batches, one FIRST.org request per
+        EPSS_BATCH_SIZE CVEs. Unknown CVEs score 0.0.
+        """
+        scores: Dict[str, float] = {}
+        misses = []
+        now = time.monotonic()
+
+        for cve_id in dict.fromkeys(cve_ids):
+            # 1. Manual Lookup (Mock Data)
+            mock_epss = self.mock_data.get(cve_id, {}).get("epss")
             if mock_epss is not None:
-                return float(mock_epss)
+                scores[cve_id] = float(mock_epss)
+                continue
 
-        # 2. API Lookup
+            # 2. Cached Lookup (memory)
+            cached = self.epss_cache.get(cve_id)
+            if cached and now - cached[1] < self.EPSS_TTL_SECONDS:
+                scores[cve_id] = cached[0]
+                continue
+            misses.append(cve_id)
+
+        # 2b. Persistent response cache, all memory misses in one query
+        persisted = self.response_cache.get_many(f"epss:{cve_id}" for cve_id in misses) if self.response_cache else {}
+        pending = []
+        for cve_id in misses:
+            score = persisted.get(f"epss:{cve_id}")
+            if score is not None:
+                scores[cve_id] = score
+                self._remember_epss(cve_id, score)
+            else:
+                scores[cve_id] = 0.0
+                pending.append(cve_id)
+
+        # 3. API Lookup
+        # Chunks are independent, so their requests overlap instead of running back to back
+        chunks = [pending[i:i + self.EPSS_BATCH_SIZE] for i in range(0, len(pending), self.EPSS_BATCH_SIZE)]
+        if len(chunks) == 1:
+            results = [self._fetch_epss_chunk(chunks[0])]
+        elif chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                results = list(executor.map(self._fetch_epss_chunk, chunks))
+        else:
+            results = []
+
+        fetched: Dict[str, float] = {}
+        for chunk, chunk_scores in zip(chunks, results):
+            if chunk_scores is None:  # Failed request: score 0.0 now, retry next time
+                continue
+            # CVEs the API does not know score 0.0 and are cached like any other answer
+            for cve_id in chunk:
+                score = chunk_scores.get(cve_id, 0.0)
+                scores[cve_id] = score
+                fetched[cve_id] = score
+                self._remember_epss(cve_id, score)
+        if self.response_cache and fetched:
+            self.response_cache.set_many({f"epss:{cve_id}": score for cve_id, score in fetched.items()})
+
+        return scores
+
+    def _remember_epss(self, cve_id: str, score: float) -> None:
+        # Bounded: the oldest entry makes room once the cache is full
+        if len(self.epss_cache) >= self.EPSS_CACHE_SIZE and cve_id not in self.epss_cache:
+            self.epss_cache.pop(next(iter(self.epss_cache)), None)
+        self.epss_cache[cve_id] = (score, time.monotonic())
+
+    def _fetch_epss_chunk(self, chunk: List[str]) -> Optional[Dict[str, float]]:
         try:
-            params = {'cve': cve_id}
+            params = {'cve': ','.join(chunk)}
             
-            response = requests.get(self.EPSS_API_URL, params=params, timeout=5)
+            response = self.session.get(self.EPSS_API_URL, params=params, timeout=10)
             # We don't raise_for_status immediately to handle empty data gracefully
             if response.status_code != 200:
-                return 0.0
-            
-            data = response.json()
+                return None
             
-            if data.get('data') and len(data['data']) > 0:
-                return float(data['data'][0].get('epss', 0.0))
-            
-            return 0.0
+            requested = set(chunk)
+            return {
+                row['cve']: float(row.get('epss', 0.0))
+                for row in response.json().get('data', []) if row.get('cve') in requested
+            }
 
         except requests.RequestException as e:
-            self.logger.error(f"Error fetching EPSS for {cve_id}: {e}")
-            return 0.0
+            self.logger.error(f"Error fetching EPSS for {len(chunk)} CVEs: {e}")
+            return None
+
+    def batch_lookup(self, cve_ids: List[str]) -> Dict[str, Tuple[float, bool]]:
+        """
+        Resolves EPSS and KEV status for many CVEs at once.
+        Each distinct CVE is looked up a single time, however often it appears.
+        """
+        epss_scores = self.get_epss_scores(cve_ids)
+        # One bounded wait for the whole batch, not one per CVE
+        self._wait_for_kev()
+        return {cve_id: (epss, cve_id in self.kev_cache) for cve_id, epss in epss_scores.items()}
 
     def is_kev(self, cve_id: str) -> bool:
         """
         Checks if the CVE exists in the locally cached CISA KEV list.
         """
+        self._wait_for_kev()
         return cve_id in self.kev_cache
 
+    def _wait_for_kev(self) -> None:
+        # Blocks for at most KEV_SYNC_WAIT_SECONDS while the initial sync is still running
+        if not self.kev_ready.is_set():
+            self.kev_ready.wait(timeout=self.KEV_SYNC_WAIT_SECONDS)
+
+    def _read_kev_ids(self, response: requests.Response) -> Set[str]:
+        """Collect the cveID of every KEV entry, streamed from the socket when ijson is available"""
+        if ijson is None:
+            vulnerabilities = response.json().get('vulnerabilities', [])
+            return {vuln.get('cveID') for vuln in vulnerabilities if vuln.get('cveID')}
+        response.raw.decode_content = True  # Let urllib3 undo gzip before ijson sees the bytes
+        return {cve for cve in ijson.items(response.raw, 'vulnerabilities.item.cveID') if cve}
+
+    def _load_kev_snapshot(self) -> Dict:
+        if not self.kev_snapshot_path or not os.path.exists(self.kev_snapshot_path):
+            return {}
+        try:
+            with open(self.kev_snapshot_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ignoring unreadable KEV snapshot: {e}")
+            return {}
+
+    def _save_kev_snapshot(self, cves: Set[str], headers) -> None:
+        if not self.kev_snapshot_path:
+            return
+        snapshot = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'cves': sorted(cves)
+        }
+        snapshot_dir = os.path.dirname(self.kev_snapshot_path)
+        tmp_path = None
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            # Written beside the target and swapped in atomically: other workers never read a partial file
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=snapshot_dir,
+                                             suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.kev_snapshot_path)
+        except OSError as e:
+            self.logger.error(f"Failed to save KEV snapshot: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     def sync_data(self) -> None:
         """
         Downloads the CISA KEV catalog and refreshes the local cache.
@@ -164,23 +335,38 @@ class ThreatIntelClient(IThreatIntelligence):
         new_cache = set()
 
         # 1. Download Real Data
+        # Conditional on the snapshot saved by the last sync, so an unchanged feed costs a 304
+        snapshot = self._load_kev_snapshot()
+        headers = {}
+        if snapshot.get('etag'):
+            headers['If-None-Match'] = snapshot['etag']
+        if snapshot.get('last_modified'):
+            headers['If-Modified-Since'] = snapshot['last_modified']
+
         try:
             self.logger.info("Syncing CISA KEV data...")
-            response = requests.get(self.CISA_KEV_URL, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                vulnerabilities = data.get('vulnerabilities', [])
-                for vuln in vulnerabilities:
-                    cve = vuln.get('cveID')
-                    if cve:
-                        new_cache.add(cve)
-                self.logger.info(f"CISA KEV synced. Loaded {len(new_cache)} vulnerabilities from feed.")
-            else:
-                self.logger.error(f"Failed to sync CISA KEV: {response.status_code}")
+            with self.session.get(self.CISA_KEV_URL, headers=headers, timeout=10,
+                                  stream=ijson is not None) as response:
+                if response.status_code == 304:
+                    new_cache.update(snapshot.get('cves', ()))
+                    self.logger.info(f"CISA KEV unchanged. Loaded {len(new_cache)} vulnerabilities from disk.")
+                elif response.status_code == 200:
+                    feed = self._read_kev_ids(response)
+                    new_cache.update(feed)
+                    self._save_kev_snapshot(feed, response.headers)
+                    self.logger.info(f"CISA KEV synced. Loaded {len(new_cache)} vulnerabilities from feed.")
+                else:
+                    self.logger.error(f"Failed to sync CISA KEV: {response.status_code}")
 
-        except requests.RequestException as e:
+        except Exception as e:
             self.logger.error(f"Failed to sync CISA KEV data: {e}")
 
+        # A stale catalog beats an empty one when the feed is unreachable
+        if not new_cache:
+            new_cache.update(snapshot.get('cves') or self.kev_cache)
+            if new_cache:
+                self.logger.info(f"Using the last known KEV catalog ({len(new_cache)} vulnerabilities).")
+
         # 2. Manual Lookup (Merge Mock Data)
         # If our test case says "kev": true, we force it into the cache.
         mock_count = 0
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from infrastructure.persistence.database import Base  
 
@@ -15,8 +15,8 @@ class SBOMModel(Base):
     name = Column(String)
     version = Column(String)
     source = Column(String)
-    raw_data = Column(Text)
-    created_at = Column(DateTime)
+    raw_data = Column(LargeBinary)  # zlib-compressed JSON; rows written before compression hold plain text
+    created_at = Column(DateTime, index=True)
     updated_at = Column(DateTime)
     
     analyses = relationship("AnalysisModel", back_populates="sbom", cascade="all, delete-orphan")
@@ -25,6 +25,8 @@ class SBOMModel(Base):
 class AnalysisModel(Base):
     """ORM model for analysis results"""
     __tablename__ = 'analyses'
+    # Latest / history lookups filter by SBOM and order by time
+    __table_args__ = (Index('ix_analyses_sbom_ts', 'sbom_id', 'timestamp'),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     sbom_id = Column(String, ForeignKey('sboms.id'))
@@ -45,7 +47,7 @@ class VulnerabilityModel(Base):
     __tablename__ = 'vulnerabilities'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    analysis_id = Column(Integer, ForeignKey('analyses.id'))
+    analysis_id = Column(Integer, ForeignKey('analyses.id'), index=True)
     cve_id = Column(String)
     component_ref = Column(String)
     component_name = Column(String)
@@ -61,4 +63,12 @@ class VulnerabilityModel(Base):
     hdfm_score = Column(Float)
     priority = Column(String)
     
-    analysis = relationship("AnalysisModel", back_populates="vulnerabilities")
\ No newline at end of file
+    analysis = relationship("AnalysisModel", back_populates="vulnerabilities")
+
+class ResponseCacheModel(Base):
+    """ORM model for cached upstream API responses (OSV.dev, Deps.dev)"""
+    __tablename__ = 'response_cache'
+    
+    key = Column(String, primary_key=True)
+    payload = Column(Text)
+    fetched_at = Column(DateTime)
@@ -1,33 +1,105 @@
+import io
 import json
-from sqlalchemy.orm import Session
+import os
+import time
+import uuid
+import zlib
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import select, desc
 from typing import Optional, List, Dict
 from datetime import datetime
 
-from core.entities import AnalysisResult, Vulnerability, Priority
+from core.entities import AnalysisResult, Vulnerability, Priority, to_flag, to_score
 from core.interface import IRepository
 
 
 from infrastructure.graph.models import SBOMModel, AnalysisModel, VulnerabilityModel
 
+try:
+    import orjson
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it the header is read from the parsed document
+    ijson = None
+
+# Low zlib levels already shrink SBOM JSON several times over at a fraction of the CPU cost
+RAW_DATA_COMPRESSION_LEVEL = 3
+
+
+def _pack_raw_data(sbom_data: Optional[Dict], raw_bytes: Optional[bytes] = None) -> bytes:
+    if raw_bytes is None:
+        raw_bytes = json_dumps(sbom_data).encode('utf-8')
+    return zlib.compress(raw_bytes, RAW_DATA_COMPRESSION_LEVEL)
+
+
+def _unpack_raw_data(raw_data) -> Dict:
+    # Rows saved before compression come back from SQLite as plain JSON text
+    if isinstance(raw_data, str):
+        return json_loads(raw_data)
+    return json_loads(zlib.decompress(raw_data))
+
+
+def _read_root_component(raw_bytes: bytes) -> Dict:
+    """metadata.component of a CycloneDX document, streamed so the component list is never materialised"""
+    if ijson is not None:
+        for component in ijson.items(io.BytesIO(raw_bytes), 'metadata.component'):
+            return component or {}
+        return {}
+    return json_loads(raw_bytes).get('metadata', {}).get('component', {})
+
+
+def _new_sbom_id() -> str:
+    """Collision-free, time-ordered SBOM id (UUIDv7 layout: 48-bit ms timestamp, then random bits)"""
+    uuid7 = getattr(uuid, 'uuid7', None)  # stdlib from Python 3.14
+    if uuid7 is not None:
+        return f"sbom_{uuid7()}"
+    millis = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (
+        (millis & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                            # version
+        | ((rand >> 62) & 0xFFF) << 64         # rand_a
+        | 0b10 << 62                           # RFC 4122 variant
+        | (rand & 0x3FFF_FFFF_FFFF_FFFF)       # rand_b
+    )
+    return f"sbom_{uuid.UUID(int=value)}"
+
 
 class SQLAlchemyRepository(IRepository):
     
     def __init__(self, session: Session):
         self.session = session
     
-    def save_sbom(self, sbom_data: Dict, source: str) -> str:
-        """Save SBOM to database"""
-        sbom_id = f"sbom_{datetime.now().timestamp()}"
+    def save_sbom(self, sbom_data: Dict, source: str, raw_bytes: Optional[bytes] = None) -> str:
+        """Save SBOM to database; raw_bytes, when given, is stored verbatim instead of re-serializing sbom_data"""
+        root = sbom_data.get('metadata', {}).get('component', {})
+        return self._insert_sbom(root, source, _pack_raw_data(sbom_data, raw_bytes))
+    
+    def save_sbom_stream(self, raw_bytes: bytes, source: str) -> str:
+        """Save an SBOM straight from its serialized form, without building the document dict"""
+        root = _read_root_component(raw_bytes)
+        return self._insert_sbom(root, source, _pack_raw_data(None, raw_bytes))
+    
+    def _insert_sbom(self, root: Dict, source: str, raw_data: bytes) -> str:
+        sbom_id = _new_sbom_id()
+        now = datetime.now()
         
         sbom = SBOMModel(
             id=sbom_id,
-            name=sbom_data.get('metadata', {}).get('component', {}).get('name', 'Unknown'),
-            version=sbom_data.get('metadata', {}).get('component', {}).get('version', 'Unknown'),
+            name=root.get('name', 'Unknown'),
+            version=root.get('version', 'Unknown'),
             source=source,
-            raw_data=json.dumps(sbom_data),
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            raw_data=raw_data,
+            created_at=now,
+            updated_at=now
         )
         
         self.session.add(sbom)
@@ -37,8 +109,8 @@ class SQLAlchemyRepository(IRepository):
     
     def get_sbom(self, sbom_id: str) -> Optional[Dict]:
         """Retrieve SBOM from database"""
-        stmt = select(SBOMModel).where(SBOMModel.id == sbom_id)
-        sbom = self.session.execute(stmt).scalar_one_or_none()
+        # Primary-key lookup: served from the identity map when the row is already loaded
+        sbom = self.session.get(SBOMModel, sbom_id)
         
         if not sbom:
             return None
@@ -48,7 +120,7 @@ class SQLAlchemyRepository(IRepository):
             'name': sbom.name,
             'version': sbom.version,
             'source': sbom.source,
-            'data': json.loads(sbom.raw_data),
+            'data': _unpack_raw_data(sbom.raw_data),
             'created_at': sbom.created_at.isoformat(),
             'updated_at': sbom.updated_at.isoformat()
         }
@@ -75,31 +147,35 @@ class SQLAlchemyRepository(IRepository):
             critical_findings=result.critical_findings,
             hub_components=result.hub_components,
             max_depth=result.max_depth,
-            entropy_weights=json.dumps(result.entropy_weights)
+            entropy_weights=json_dumps(result.entropy_weights)
         )
         
         self.session.add(analysis)
         self.session.flush()
 
-        for vuln in result.vulnerabilities:
-            vuln_model = VulnerabilityModel(
-                analysis_id=analysis.id,
-                cve_id=vuln.id,
-                component_ref=vuln.component_ref,
-                component_name=vuln.component_name,
-                cvss_score=vuln.cvss_score,
-                cvss_vector=vuln.cvss_vector,
-                description=vuln.description,
-                severity=vuln.severity,
-                tcs=vuln.tcs,
-                vei=vuln.vei,
-                epss=vuln.epss,
-                kev=vuln.kev,
-                exploitability=vuln.exploitability,
-                hdfm_score=vuln.hdfm_score,
-                priority=vuln.priority.value
-            )
-            self.session.add(vuln_model)
+        # One executemany INSERT instead of an ORM object per finding
+        rows = [
+            {
+                'analysis_id': analysis.id,
+                'cve_id': vuln.id,
+                'component_ref': vuln.component_ref,
+                'component_name': vuln.component_name,
+                'cvss_score': vuln.cvss_score,
+                'cvss_vector': vuln.cvss_vector,
+                'description': vuln.description,
+                'severity': vuln.severity,
+                'tcs': vuln.tcs,
+                'vei': vuln.vei,
+                'epss': vuln.epss,
+                'kev': vuln.kev,
+                'exploitability': vuln.exploitability,
+                'hdfm_score': vuln.hdfm_score,
+                'priority': vuln.priority.value
+            }
+            for vuln in result.vulnerabilities
+        ]
+        if rows:
+            self.session.execute(VulnerabilityModel.__table__.insert(), rows)
         
         self.session.commit()
     
@@ -110,6 +186,7 @@ class SQLAlchemyRepository(IRepository):
             .where(AnalysisModel.sbom_id == sbom_id)
             .order_by(desc(AnalysisModel.timestamp))
             .limit(1)
+            .options(selectinload(AnalysisModel.vulnerabilities))
         )
         analysis = self.session.execute(stmt).scalar_one_or_none()
         
@@ -118,12 +195,16 @@ class SQLAlchemyRepository(IRepository):
         
         return self._convert_to_domain(analysis)
     
-    def get_all_analyses(self, sbom_id: str) -> List[AnalysisResult]:
-        """Get all analyses for SBOM (for trend analysis)"""
+    def get_all_analyses(self, sbom_id: str, limit: Optional[int] = None, offset: int = 0) -> List[AnalysisResult]:
+        """Get analyses for SBOM, newest first (for trend analysis); limit/offset page through long histories"""
         stmt = (
             select(AnalysisModel)
             .where(AnalysisModel.sbom_id == sbom_id)
             .order_by(desc(AnalysisModel.timestamp))
+            .limit(limit)
+            .offset(offset)
+            # Findings of every analysis arrive in one IN query instead of one query each
+            .options(selectinload(AnalysisModel.vulnerabilities))
         )
         analyses = self.session.execute(stmt).scalars().all()
         
@@ -138,16 +219,17 @@ class SQLAlchemyRepository(IRepository):
                 id=v.cve_id,
                 component_ref=v.component_ref,
                 component_name=v.component_name,
-                cvss_score=v.cvss_score,
+                # SQLite keeps whatever type a legacy row was written with, so scores are coerced here
+                cvss_score=to_score(v.cvss_score),
                 cvss_vector=v.cvss_vector,
                 description=v.description,
-                severity=v.severity,
-                tcs=v.tcs,
-                vei=v.vei,
-                epss=v.epss,
-                kev=v.kev,
-                exploitability=v.exploitability,
-                hdfm_score=v.hdfm_score,
+                severity=to_score(v.severity),
+                tcs=to_score(v.tcs),
+                vei=to_score(v.vei),
+                epss=to_score(v.epss),
+                kev=to_flag(v.kev),
+                exploitability=to_score(v.exploitability),
+                hdfm_score=to_score(v.hdfm_score),
                 priority=Priority(v.priority)
             )
             vulnerabilities.append(vuln)
@@ -161,5 +243,5 @@ class SQLAlchemyRepository(IRepository):
             hub_components=analysis.hub_components,
             max_depth=analysis.max_depth,
             vulnerabilities=vulnerabilities,
-            entropy_weights=json.loads(analysis.entropy_weights)
+            entropy_weights=json_loads(analysis.entropy_weights)
         )
\ No newline at end of file
@@ -1,13 +1,37 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 Base = declarative_base()
 
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+# turns the fsync on every commit into one per checkpoint.
+# While connections are open SQLite keeps hdfm_sbom.db-wal / -shm sidecar files next to the database.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 
 def create_database_engine(db_url: str = "sqlite:///hdfm_sbom.db"):
     """Create SQLAlchemy engine"""
     engine = create_engine(db_url, echo=False)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
     Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, so indexes added later are created here
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
 
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from infrastructure.graph.models import ResponseCacheModel
+
+
+class ResponseCache:
+    """
+    Persistent TTL cache for upstream API responses.
+    Lets repeated scans of the same packages skip the network entirely.
+    """
+    
+    KEY_CHUNK_SIZE = 500  # Keeps IN lists well below SQLite's bound-parameter limit
+    
+    def __init__(self, engine, ttl: timedelta = timedelta(days=1)):
+        self.engine = engine
+        self.ttl = ttl
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached JSON value, or None when missing or expired"""
+        with Session(self.engine) as session:
+            entry = session.get(ResponseCacheModel, key)
+            if not entry or entry.fetched_at < datetime.now() - self.ttl:
+                return None
+            return json.loads(entry.payload)
+    
+    def set(self, key: str, value: Any) -> None:
+        with Session(self.engine) as session:
+            session.merge(ResponseCacheModel(
+                key=key,
+                payload=json.dumps(value),
+                fetched_at=datetime.now()
+            ))
+            session.commit()
+    
+    def get_many(self, keys: Iterable[str], max_age: Optional[timedelta] = None) -> Dict[str, Any]:
+        """Fresh cached values for the given keys in one query per chunk; misses are left out"""
+        keys = list(keys)
+        cutoff = datetime.now() - (max_age or self.ttl)
+        found = {}
+        with Session(self.engine) as session:
+            for i in range(0, len(keys), self.KEY_CHUNK_SIZE):
+                stmt = select(ResponseCacheModel.key, ResponseCacheModel.payload).where(
+                    ResponseCacheModel.key.in_(keys[i:i + self.KEY_CHUNK_SIZE]),
+                    ResponseCacheModel.fetched_at >= cutoff
+                )
+                for key, payload in session.execute(stmt):
+                    found[key] = json.loads(payload)
+        return found
+    
+    def set_many(self, values: Dict[str, Any]) -> None:
+        """Store several values in a single transaction"""
+        if not values:
+            return
+        now = datetime.now()
+        keys = list(values)
+        with Session(self.engine) as session:
+            for i in range(0, len(keys), self.KEY_CHUNK_SIZE):
+                session.execute(delete(ResponseCacheModel).where(
+                    ResponseCacheModel.key.in_(keys[i:i + self.KEY_CHUNK_SIZE])
+                ))
+            session.execute(insert(ResponseCacheModel), [
+                {'key': key, 'payload': json.dumps(value), 'fetched_at': now}
+                for key, value in values.items()
+            ])
+            session.commit()
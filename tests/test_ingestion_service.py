@@ -0,0 +1,64 @@
+import unittest
+
+from application.service.ingestion_service import IngestionService
+
+
+class _NoVulnLookup:
+    """Lookup stub without PURL batch support; scores come from the SBOM only"""
+
+    def lookup_vulnerability(self, vuln_id):
+        return None
+
+
+class _NoMetadata:
+    def get_metadata(self, components):
+        return {}
+
+
+def _sbom(score):
+    return {
+        'components': [{'bom-ref': 'pkg:pypi/demo@1.0', 'name': 'demo', 'version': '1.0'}],
+        'vulnerabilities': [{
+            'id': 'CVE-2024-0001',
+            'ratings': [{'score': score, 'vector': 'CVSS:3.1/AV:N'}],
+            'affects': [{'ref': 'pkg:pypi/demo@1.0'}],
+        }],
+    }
+
+
+class ParseSbomScoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = IngestionService(_NoVulnLookup(), _NoMetadata())
+
+    def _vuln(self, score):
+        components, _ = self.service.parse_sbom(_sbom(score))
+        return components[0].vulnerabilities[0]
+
+    def test_string_score_is_coerced_to_float(self):
+        vuln = self._vuln("7.5")
+        self.assertIsInstance(vuln.cvss_score, float)
+        self.assertEqual(vuln.cvss_score, 7.5)
+        self.assertAlmostEqual(vuln.severity, 0.75)
+
+    def test_unparseable_score_falls_back_to_zero(self):
+        vuln = self._vuln("INFO")
+        self.assertEqual(vuln.cvss_score, 0.0)
+        self.assertEqual(vuln.severity, 0.0)
+
+
+
+class ParseSbomAffectsTest(unittest.TestCase):
+
+    def test_affects_entry_with_versions_matches_component(self):
+        sbom = _sbom("7.5")
+        sbom['vulnerabilities'][0]['affects'] = [
+            {'ref': 'pkg:pypi/demo@1.0', 'versions': [{'version': '1.0', 'status': 'affected'}]},
+            {'ref': ['not', 'a', 'ref']},
+        ]
+        components, _ = IngestionService(_NoVulnLookup(), _NoMetadata()).parse_sbom(sbom)
+        self.assertEqual([v.id for v in components[0].vulnerabilities], ['CVE-2024-0001'])
+
+
+if __name__ == '__main__':
+    unittest.main()
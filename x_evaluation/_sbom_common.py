@@ -0,0 +1,50 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+try:
+    import orjson
+
+    def dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+def create_base_sbom(app_name, app_version="1.0.0", root_ref="root-app", vulnerabilities=None):
+    sbom = {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
+        "version": 1,
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+            "component": {
+                "type": "application",
+                "name": app_name,
+                "version": app_version,
+                "bom-ref": root_ref
+            }
+        },
+        "components": [],
+        "dependencies": []
+    }
+    # Custom Mock Dictionary Format for Classic Eval Script
+    if vulnerabilities is not None:
+        sbom["vulnerabilities"] = vulnerabilities
+    return sbom
+
+def create_component(purl_type, name, version, group=None, type="library"):
+    """
+    ('npm', 'lodash', '4.17.21') -> pkg:npm/lodash@4.17.21
+    ('npm', 'core', '7.0.0', '@babel') -> pkg:npm/@babel/core@7.0.0
+    """
+    full_name = f"{group}/{name}" if group else name
+    purl = f"pkg:{purl_type}/{full_name}@{version}"
+    return {
+        "type": type,
+        "name": full_name,
+        "version": version,
+        "bom-ref": purl,
+        "purl": purl
+    }
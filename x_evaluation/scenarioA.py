@@ -1,59 +1,19 @@
-import json
-import uuid
-from datetime import datetime
+from _sbom_common import create_base_sbom, create_component, dumps_indented
 
 FILENAME = "sbom_scenario_A_realworld.json"
 
-def create_base_sbom():
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
-        "version": 1,
-        "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "component": {
-                "type": "application",
-                "name": "Production-App-Scenario-A",
-                "version": "2.0.0",
-                "bom-ref": "root-app"
-            }
-        },
-        "components": [],
-        "dependencies": []
-    }
-
-def create_component(group, name, version, type="library"):
-    if group:
-        purl = f"pkg:pypi/{name}@{version}" # Simplified PURL for OSV
-        full_name = name
-    else:
-        purl = f"pkg:npm/{name}@{version}"
-        full_name = name
-        
-    return {
-        "type": type,
-        "name": full_name,
-        "version": version,
-        "bom-ref": purl,
-        "purl": purl
-    }
-
 def generate_scenario_A_real():
-    sbom = create_base_sbom()
+    sbom = create_base_sbom("Production-App-Scenario-A", "2.0.0")
     root_ref = "root-app"
     deps_map = {root_ref: []}
 
-    c1 = create_component(None, "internal-analytics", "1.0.0")
-    sbom['components'].append(c1)
+    c1 = create_component("npm", "internal-analytics", "1.0.0")
     deps_map[root_ref].append(c1['bom-ref'])
 
-    c2 = create_component(None, "report-generator", "2.5.0")
-    sbom['components'].append(c2)
+    c2 = create_component("npm", "report-generator", "2.5.0")
     deps_map[c1['bom-ref']] = [c2['bom-ref']]
     
-    c3 = create_component("Django", "django", "3.2.0")
-    sbom['components'].append(c3)
+    c3 = create_component("pypi", "django", "3.2.0")
     deps_map[c2['bom-ref']] = [c3['bom-ref']]
     deps_map[c3['bom-ref']] = [] # Leaf node
 
@@ -71,21 +31,22 @@ def generate_scenario_A_real():
         ("zone.js", "0.13.0")  
     ]
 
-    for name, version in safe_libs:
-        comp = create_component(None, name, version)
-        sbom['components'].append(comp)
-
+    safe_comps = [create_component("npm", name, version) for name, version in safe_libs]
+    for comp in safe_comps:
         deps_map[root_ref].append(comp['bom-ref'])
         deps_map[comp['bom-ref']] = []
 
-    for parent, children in deps_map.items():
-        sbom['dependencies'].append({"ref": parent, "dependsOn": children})
+    sbom['components'] = [c1, c2, c3, *safe_comps]
+
+    sbom['dependencies'] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     return sbom
 
 # --- EXECUTE ---
-data = generate_scenario_A_real()
-with open(FILENAME, "w") as f:
-    json.dump(data, f, indent=2)
-print(f"Generated {FILENAME}")
-print("Contains 'django@3.2.0' (Real CVSS 10.0) nested 3 levels deep.")
\ No newline at end of file
+if __name__ == "__main__":
+    data = generate_scenario_A_real()
+    payload = dumps_indented(data)
+    with open(FILENAME, "wb") as f:
+        f.write(payload)
+    print(f"Generated {FILENAME}")
+    print("Contains 'django@3.2.0' (Real CVSS 10.0) nested 3 levels deep.")
\ No newline at end of file
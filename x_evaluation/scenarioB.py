@@ -1,4 +1,4 @@
-import json
+from _sbom_common import dumps_indented
 
 FILENAME = "TC02_LatentGiant.json"
 
@@ -47,8 +47,7 @@ def generate_tc02():
     sbom["components"] = components_list
     
     # Flatten dependencies for JSON
-    for parent, children in deps_map.items():
-        sbom["dependencies"].append({"ref": parent, "dependsOn": children})
+    sbom["dependencies"] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     # 4. Inject Vulnerability Metadata (The "Latent" aspect)
     # Low Severity, Local Access, Low Probability.
@@ -68,8 +67,9 @@ def generate_tc02():
 
 if __name__ == "__main__":
     data = generate_tc02()
-    with open(FILENAME, "w") as f:
-        json.dump(data, f, indent=2)
+    payload = dumps_indented(data)
+    with open(FILENAME, "wb") as f:
+        f.write(payload)
     print(f"Generated {FILENAME}")
     print("Graph Characteristics: 15 dependents on 'core-parser' (High Centrality)")
     print("Vulnerability Characteristics: CVSS 4.1 (Local), EPSS 0.001")
\ No newline at end of file
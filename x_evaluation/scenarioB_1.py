@@ -1,6 +1,6 @@
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 FILENAME = "./generator/TC02_LatentGiant2.json"
 
@@ -12,7 +12,7 @@ def generate_tc02_standard():
         "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
         "version": 1,
         "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
             "component": {
                 "type": "application",
                 "name": "Production-App-Scenario-B",
@@ -58,8 +58,7 @@ def generate_tc02_standard():
     sbom["components"] = components_list
     
     # Flatten dependencies
-    for parent, children in deps_map.items():
-        sbom["dependencies"].append({"ref": parent, "dependsOn": children})
+    sbom["dependencies"] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     # 4. Inject Vulnerability (Standard CycloneDX Format)
     vuln = {
@@ -1,6 +1,6 @@
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 FILENAME = "./generator/TC04_PaperTiger2.json"
 
@@ -12,7 +12,7 @@ def generate_tc04_standard():
         "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
         "version": 1,
         "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
             "component": {
                 "type": "application",
                 "name": "Hardware-Interface-App-Scenario-D",
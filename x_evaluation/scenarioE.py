@@ -1,30 +1,8 @@
 import json
-import uuid
-from datetime import datetime
+from _sbom_common import create_base_sbom
 
 FILENAME = "TC05_VexFiltered.json"
 
-def create_base_sbom():
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
-        "version": 1,
-        "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "component": {
-                "type": "application",
-                "name": "Production-App-Scenario-E",
-                "version": "1.0.0",
-                "bom-ref": "root-app"
-            }
-        },
-        "components": [],
-        "dependencies": [],
-        # This block is for HDFM / Classic Eval parsing
-        "vulnerabilities": {}
-    }
-
 def create_component(group, name, version):
     if group:
         purl = f"pkg:{group}/{name}@{version}"
@@ -43,7 +21,7 @@ def create_component(group, name, version):
     }
 
 def generate_scenario_E_real():
-    sbom = create_base_sbom()
+    sbom = create_base_sbom("Production-App-Scenario-E", vulnerabilities={})
     root_ref = "root-app"
     deps_map = {root_ref: []}
 
@@ -82,8 +60,7 @@ def generate_scenario_E_real():
         deps_map[comp['bom-ref']] = []
 
     # 3. Construct Dependencies Array
-    for parent, children in deps_map.items():
-        sbom['dependencies'].append({"ref": parent, "dependsOn": children})
+    sbom['dependencies'] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     # 4. Inject the Mock Vulnerability
     # SCENARIO: Critical Metrics, but VEX says "No".
@@ -1,53 +1,16 @@
 import json
-import uuid
-from datetime import datetime
+from _sbom_common import create_base_sbom, create_component
 
 FILENAME = "TC06_PaperTiger.json"
 
-def create_base_sbom():
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
-        "version": 1,
-        "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "component": {
-                "type": "application",
-                "name": "Hardware-Interface-App-Scenario-F",
-                "version": "1.0.0",
-                "bom-ref": "root-app"
-            }
-        },
-        "components": [],
-        "dependencies": [],
-        "vulnerabilities": {}
-    }
-
-def create_component(group, name, version):
-    if group:
-        purl = f"pkg:npm/{group}/{name}@{version}"
-        full_name = f"{group}/{name}"
-    else:
-        purl = f"pkg:npm/{name}@{version}"
-        full_name = name
-        
-    return {
-        "type": "library",
-        "name": full_name,
-        "version": version,
-        "bom-ref": purl,
-        "purl": purl
-    }
-
 def generate_scenario_F_real():
-    sbom = create_base_sbom()
+    sbom = create_base_sbom("Hardware-Interface-App-Scenario-F", vulnerabilities={})
     root_ref = "root-app"
     deps_map = {root_ref: []}
 
     # 1. The "Paper Tiger" Target Component
     # A driver library that implies hardware interaction
-    target_comp = create_component(None, "usb-driver", "1.0.0")
+    target_comp = create_component("npm", "usb-driver", "1.0.0")
     sbom['components'].append(target_comp)
     deps_map[root_ref].append(target_comp['bom-ref'])
     deps_map[target_comp['bom-ref']] = []
@@ -68,7 +31,7 @@ def generate_scenario_F_real():
     ]
 
     for group, name, version in safe_libs:
-        comp = create_component(group, name, version)
+        comp = create_component("npm", name, version, group)
         sbom['components'].append(comp)
         
         # Link Root -> Lib (Direct dependencies)
@@ -76,8 +39,7 @@ def generate_scenario_F_real():
         deps_map[comp['bom-ref']] = []
 
     # 3. Construct Dependencies Array
-    for parent, children in deps_map.items():
-        sbom['dependencies'].append({"ref": parent, "dependsOn": children})
+    sbom['dependencies'] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     # 4. Inject the Mock Vulnerability
     # SCENARIO: High Impact Score (7.6), typically flagging "High" priority.
@@ -1,47 +1,16 @@
 import json
-import uuid
-from datetime import datetime
+from _sbom_common import create_base_sbom, create_component
 
 FILENAME = "./generator/TC08_StructuralBottleneck.json"
 
-def create_base_sbom():
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
-        "version": 1,
-        "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "component": {
-                "type": "application",
-                "name": "Legacy-Monolith-Scenario-H",
-                "version": "5.0.0",
-                "bom-ref": "root-app"
-            }
-        },
-        "components": [],
-        "dependencies": [],
-        "vulnerabilities": {}
-    }
-
-def create_component(name, version):
-    purl = f"pkg:npm/{name}@{version}"
-    return {
-        "type": "library",
-        "name": name,
-        "version": version,
-        "bom-ref": purl,
-        "purl": purl
-    }
-
 def generate_scenario_H_real():
-    sbom = create_base_sbom()
+    sbom = create_base_sbom("Legacy-Monolith-Scenario-H", "5.0.0", vulnerabilities={})
     root_ref = "root-app"
     deps_map = {root_ref: []}
 
     # 1. The Target: A low-level utility (e.g., 'left-pad' style)
     # It seems unimportant, but it is a "Bottleneck".
-    target_comp = create_component("common-utils", "1.0.0")
+    target_comp = create_component("npm", "common-utils", "1.0.0")
     sbom['components'].append(target_comp)
     # The root uses it
     deps_map[root_ref].append(target_comp['bom-ref'])
@@ -51,7 +20,7 @@ def generate_scenario_H_real():
     # This forces In-Degree Centrality to be Maximum (100% of libs use it).
     for i in range(20):
         comp_name = f"feature-module-{i}"
-        comp = create_component(comp_name, "2.1.0")
+        comp = create_component("npm", comp_name, "2.1.0")
         sbom['components'].append(comp)
         
         # Link: Root -> Feature -> Target
@@ -59,8 +28,7 @@ def generate_scenario_H_real():
         deps_map[comp['bom-ref']] = [target_comp['bom-ref']]
 
     # 3. Construct Dependencies
-    for parent, children in deps_map.items():
-        sbom['dependencies'].append({"ref": parent, "dependsOn": children})
+    sbom['dependencies'] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     # 4. Inject Vulnerability
     # SCENARIO: 
@@ -1,53 +1,15 @@
 import json
-import uuid
-from datetime import datetime
+from _sbom_common import create_base_sbom, create_component
 
 FILENAME = "TC07_SilentKiller.json"
 
-def create_base_sbom():
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
-        "version": 1,
-        "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "component": {
-                "type": "application",
-                "name": "Web-Backend-App-Scenario-G",
-                "version": "2.1.0",
-                "bom-ref": "root-app"
-            }
-        },
-        "components": [],
-        "dependencies": [],
-        # Custom Mock Dictionary Format for Classic Eval Script
-        "vulnerabilities": {}
-    }
-
-def create_component(group, name, version):
-    if group:
-        purl = f"pkg:pypi/{group}/{name}@{version}"
-        full_name = f"{group}/{name}"
-    else:
-        purl = f"pkg:pypi/{name}@{version}"
-        full_name = name
-        
-    return {
-        "type": "library",
-        "name": full_name,
-        "version": version,
-        "bom-ref": purl,
-        "purl": purl
-    }
-
 def generate_scenario_G_classic():
-    sbom = create_base_sbom()
+    sbom = create_base_sbom("Web-Backend-App-Scenario-G", "2.1.0", vulnerabilities={})
     root_ref = "root-app"
     deps_map = {root_ref: []}
 
     # 1. The Target: 'requests' (Ubiquitous HTTP library)
-    target_comp = create_component(None, "requests", "2.0.0")
+    target_comp = create_component("pypi", "requests", "2.0.0")
     sbom['components'].append(target_comp)
     
     # Root uses it directly
@@ -65,7 +27,7 @@ def generate_scenario_G_classic():
     ]
 
     for group, name, version in safe_libs:
-        comp = create_component(group, name, version)
+        comp = create_component("pypi", name, version, group)
         sbom['components'].append(comp)
         
         # Link: Root -> Lib
@@ -73,8 +35,7 @@ def generate_scenario_G_classic():
         deps_map[comp['bom-ref']] = []
 
     # 3. Construct Dependencies Array
-    for parent, children in deps_map.items():
-        sbom['dependencies'].append({"ref": parent, "dependsOn": children})
+    sbom['dependencies'] = [{"ref": parent, "dependsOn": children} for parent, children in deps_map.items()]
 
     # 4. Inject Vulnerability (Mock Dictionary Format)
     # SCENARIO: Medium Severity (5.3) but High EPSS (0.96)
@@ -1,32 +1,10 @@
 import json
-import uuid
-from datetime import datetime
+from _sbom_common import create_base_sbom
 
 FILENAME = "TC10_EntropyAdapter.json"
 
-def create_base_sbom():
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": f"urn:uuid:{str(uuid.uuid4())}",
-        "version": 1,
-        "metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "component": {
-                "type": "application",
-                "name": "Entropy-Test-App-Scenario-J",
-                "version": "1.0.0",
-                "bom-ref": "root-app@1.0.0"
-            }
-        },
-        "components": [],
-        "dependencies": [],
-        # Custom Mock Dictionary Format for Classic Eval Script
-        "vulnerabilities": {}
-    }
-
 def generate_scenario_J_real():
-    sbom = create_base_sbom()
+    sbom = create_base_sbom("Entropy-Test-App-Scenario-J", root_ref="root-app@1.0.0", vulnerabilities={})
     root_ref = "root-app@1.0.0"
     
     # 1. Define Components (50 items)